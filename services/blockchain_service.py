@@ -1,15 +1,79 @@
 import os
+import time
 from web3 import Web3
+from web3.exceptions import ContractLogicError
 import logging
 from eth_account import Account
 import json
 
+try:
+    from web3.exceptions import Web3RPCError
+except ImportError:  # web3 v6 raises ValueError for node-side RPC errors
+    Web3RPCError = ValueError
+
 logger = logging.getLogger(__name__)
 
+# Headroom applied on top of eth_estimateGas so small state changes between
+# estimation and inclusion don't push the transaction out of gas.
+GAS_ESTIMATE_MULTIPLIER = 1.2
+
+# How long a cached estimate is reused (a handful of mainnet blocks).
+GAS_CACHE_TTL = 60
+
+# Errors the node returns for a failing execution; transport errors propagate.
+EXECUTION_ERRORS = (ContractLogicError, Web3RPCError, ValueError)
+
 class BlockchainService:
     def __init__(self):
         self.w3 = Web3(Web3.HTTPProvider(os.getenv('WEB3_PROVIDER_URL')))
         self.account = Account.from_key(os.getenv('PRIVATE_KEY'))
+        # (to address, 4-byte selector) -> (padded gas limit, expiry time)
+        self._gas_cache = {}
+
+    def _call_key(self, transaction: dict):
+        data = transaction.get('data') or '0x'
+        return (transaction['to'], data[:10])
+
+    def _simulate(self, call: dict, gas: int):
+        """Dry-run the call with the gas limit it will be sent with."""
+        try:
+            self.w3.eth.call({**call, 'gas': gas})
+        except EXECUTION_ERRORS as e:
+            raise ValueError(f"Transaction would fail with gas limit {gas}: {str(e)}") from e
+
+    def _prepare_gas(self, transaction: dict, gas=None) -> int:
+        """Simulate the transaction and return the gas limit to send it with.
+
+        Raises ValueError if the call would revert or run out of gas, so
+        nothing is broadcast. Estimates are cached per (to, selector) for
+        GAS_CACHE_TTL seconds; a cache hit dry-runs with eth_call instead of
+        paying for eth_estimateGas.
+        """
+        call = {k: v for k, v in transaction.items() if k in ('to', 'value', 'data')}
+        call['from'] = self.account.address
+
+        if gas is not None:
+            self._simulate(call, gas)
+            return gas
+
+        key = self._call_key(transaction)
+        cached = self._gas_cache.get(key)
+        if cached and cached[1] > time.monotonic():
+            try:
+                self._simulate(call, cached[0])
+                return cached[0]
+            except ValueError:
+                # Heavier arguments than the call that was estimated; retry once
+                pass
+        self._gas_cache.pop(key, None)
+
+        try:
+            estimate = self.w3.eth.estimate_gas(call)
+        except EXECUTION_ERRORS as e:
+            raise ValueError(f"Transaction would revert: {str(e)}") from e
+        limit = int(estimate * GAS_ESTIMATE_MULTIPLIER)
+        self._gas_cache[key] = (limit, time.monotonic() + GAS_CACHE_TTL)
+        return limit
 
     async def execute_transaction(self, params: dict):
         try:
@@ -27,19 +91,31 @@ class BlockchainService:
             transaction = {
                 'to': Web3.to_checksum_address(params['to']),
                 'value': value_wei,
-                'gas': params.get('gas', 21000),
                 'gasPrice': self.w3.eth.gas_price,
                 'nonce': self.w3.eth.get_transaction_count(self.account.address),
                 'chainId': self.w3.eth.chain_id
             }
 
             if 'data' in params:
-                transaction['data'] = params['data']
+                try:
+                    transaction['data'] = Web3.to_hex(Web3.to_bytes(hexstr=params['data']))
+                except (TypeError, ValueError):
+                    raise ValueError(f"Invalid transaction data, expected hex: {params['data']!r}")
+
+            gas = params.get('gas')
+            if isinstance(gas, str):
+                gas = Web3.to_int(hexstr=gas) if gas.startswith('0x') else int(gas)
+            elif gas is not None:
+                gas = int(gas)
+
+            transaction['gas'] = self._prepare_gas(transaction, gas)
 
             signed_txn = self.account.sign_transaction(transaction)
             tx_hash = self.w3.eth.send_raw_transaction(signed_txn.rawTransaction)
             
             tx_receipt = self.w3.eth.wait_for_transaction_receipt(tx_hash)
+            if tx_receipt['status'] != 1:
+                self._gas_cache.pop(self._call_key(transaction), None)
             
             return {
                 'transaction_hash': tx_hash.hex(),
@@ -0,0 +1,112 @@
+import asyncio
+import unittest
+from unittest.mock import MagicMock, patch
+
+from web3.exceptions import ContractLogicError
+
+from services import blockchain_service
+from services.blockchain_service import BlockchainService, GAS_ESTIMATE_MULTIPLIER
+
+TO = '0x000000000000000000000000000000000000dEaD'
+TRANSFER = '0xa9059cbb' + '00' * 64
+
+
+def make_service():
+    service = BlockchainService.__new__(BlockchainService)
+    service.w3 = MagicMock()
+    service.account = MagicMock(address='0x0000000000000000000000000000000000000001')
+    service._gas_cache = {}
+    return service
+
+
+class PrepareGasTest(unittest.TestCase):
+    def setUp(self):
+        self.service = make_service()
+        self.eth = self.service.w3.eth
+        self.tx = {'to': TO, 'value': 0, 'data': TRANSFER}
+
+    def test_caller_gas_is_simulated_with_that_limit(self):
+        self.assertEqual(self.service._prepare_gas(self.tx, 50000), 50000)
+        self.assertEqual(self.eth.call.call_args[0][0]['gas'], 50000)
+        self.eth.estimate_gas.assert_not_called()
+
+    def test_caller_gas_too_low_is_rejected(self):
+        self.eth.call.side_effect = ValueError('out of gas')
+        with self.assertRaises(ValueError):
+            self.service._prepare_gas(self.tx, 21000)
+
+    def test_miss_estimates_and_pads(self):
+        self.eth.estimate_gas.return_value = 50000
+        limit = self.service._prepare_gas(self.tx)
+        self.assertEqual(limit, int(50000 * GAS_ESTIMATE_MULTIPLIER))
+        self.eth.call.assert_not_called()
+        self.eth.block_number.assert_not_called()
+
+    def test_hit_skips_estimate_and_dry_runs_cached_limit(self):
+        self.eth.estimate_gas.return_value = 50000
+        limit = self.service._prepare_gas(self.tx)
+        self.assertEqual(self.service._prepare_gas(dict(self.tx)), limit)
+        self.assertEqual(self.eth.estimate_gas.call_count, 1)
+        self.assertEqual(self.eth.call.call_args[0][0]['gas'], limit)
+
+    def test_failed_hit_evicts_and_reestimates_once(self):
+        self.eth.estimate_gas.return_value = 50000
+        self.service._prepare_gas(self.tx)
+        self.eth.call.side_effect = ValueError('out of gas')
+        self.eth.estimate_gas.return_value = 90000
+        limit = self.service._prepare_gas(self.tx)
+        self.assertEqual(limit, int(90000 * GAS_ESTIMATE_MULTIPLIER))
+        self.assertEqual(self.eth.estimate_gas.call_count, 2)
+        self.assertEqual(self.eth.call.call_count, 1)
+
+    def test_expired_entry_is_reestimated(self):
+        self.eth.estimate_gas.return_value = 50000
+        with patch.object(blockchain_service.time, 'monotonic', return_value=0):
+            self.service._prepare_gas(self.tx)
+        with patch.object(blockchain_service.time, 'monotonic',
+                          return_value=blockchain_service.GAS_CACHE_TTL + 1):
+            self.service._prepare_gas(self.tx)
+        self.assertEqual(self.eth.estimate_gas.call_count, 2)
+        self.eth.call.assert_not_called()
+
+    def test_revert_is_rejected_and_not_cached(self):
+        self.eth.estimate_gas.side_effect = ContractLogicError('execution reverted')
+        with self.assertRaises(ValueError) as ctx:
+            self.service._prepare_gas(self.tx)
+        self.assertIsInstance(ctx.exception.__cause__, ContractLogicError)
+        self.assertEqual(self.service._gas_cache, {})
+
+    def test_transport_errors_propagate(self):
+        self.eth.call.side_effect = ConnectionError('node unreachable')
+        with self.assertRaises(ConnectionError):
+            self.service._prepare_gas(self.tx, 50000)
+
+
+class ExecuteTransactionTest(unittest.TestCase):
+    def setUp(self):
+        self.service = make_service()
+        self.eth = self.service.w3.eth
+        self.eth.wait_for_transaction_receipt.return_value = {'blockNumber': 1, 'status': 1}
+
+    def test_hex_gas_is_accepted(self):
+        asyncio.run(self.service.execute_transaction(
+            {'to': TO, 'value': 0, 'data': TRANSFER, 'gas': '0x5208'}))
+        signed = self.service.account.sign_transaction.call_args[0][0]
+        self.assertEqual(signed['gas'], 21000)
+
+    def test_non_hex_data_is_rejected_before_simulation(self):
+        with self.assertRaises(ValueError):
+            asyncio.run(self.service.execute_transaction(
+                {'to': TO, 'value': 0, 'data': 'transfer(alice)'}))
+        self.eth.call.assert_not_called()
+        self.eth.estimate_gas.assert_not_called()
+
+    def test_failed_receipt_evicts_cached_estimate(self):
+        self.eth.estimate_gas.return_value = 50000
+        self.eth.wait_for_transaction_receipt.return_value = {'blockNumber': 1, 'status': 0}
+        asyncio.run(self.service.execute_transaction({'to': TO, 'value': 0, 'data': TRANSFER}))
+        self.assertEqual(self.service._gas_cache, {})
+
+
+if __name__ == '__main__':
+    unittest.main()